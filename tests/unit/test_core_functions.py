@@ -195,6 +195,33 @@ class TestCoreFunctions(unittest.TestCase):
         self.assertIn("Company name is required", message)
 
 
+class TestPWinScoring(unittest.TestCase):
+    """Test P-Win keyword scoring"""
+
+    @unittest.skipIf(govcon_suite is None, "govcon_suite module not available")
+    def test_compiled_scorer_matches_keyword_loop(self):
+        """Test generated keyword scorers agree with a plain loop over the lists"""
+        text = "cloud devops and database work, plus some construction and logistics"
+
+        expected_positive = sum(10 for k in govcon_suite.POSITIVE_KEYWORDS if k in text)
+        expected_negative = sum(10 for k in govcon_suite.NEGATIVE_KEYWORDS if k in text)
+
+        self.assertEqual(govcon_suite._score_positive(text), expected_positive)
+        self.assertEqual(govcon_suite._score_negative(text), expected_negative)
+        self.assertEqual(govcon_suite._score_positive(""), 0)
+
+    @unittest.skipIf(govcon_suite is None, "govcon_suite module not available")
+    def test_calculate_p_win_keywords_and_naics(self):
+        """Test NAICS match plus positive and negative keywords"""
+        score = govcon_suite.calculate_p_win({
+            "naicsCode": "541511",
+            "title": "Cloud Cybersecurity Support",
+            "description": "Includes logistics"
+        })
+
+        self.assertEqual(score, 50 + 10 + 10 - 10)
+
+
 class TestDocumentProcessing(unittest.TestCase):
     """Test Phase 6 document analysis functions"""
     
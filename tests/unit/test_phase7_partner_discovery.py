@@ -10,6 +10,7 @@ import os
 from unittest.mock import Mock, patch, MagicMock
 import json
 import uuid
+import time
 
 # Add project root to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -22,6 +23,15 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
         self.test_requirements = "Looking for software development partners with Python expertise and government contracting experience"
         self.test_keywords = ["software", "development", "python"]
         self.test_location = "Virginia"
+
+        # Partner search results are cached per process; start each test cold
+        import govcon_suite
+        govcon_suite._PARTNER_CACHE.clear()
+        govcon_suite._ddg_search_cached.cache_clear()
+        govcon_suite._DDGS_CLIENT = None
+        govcon_suite._MCP_CACHE.clear()
+        govcon_suite._PERF_CACHE.clear()
+        govcon_suite._dashboard_cached.cache_clear()
         
         self.mock_partners = [
             {
@@ -59,8 +69,8 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
                 }
             }
             
-            # Mock requests.post for MCP calls
-            with patch('govcon_suite.requests.post') as mock_post:
+            # Mock the MCP session post for MCP calls
+            with patch('govcon_suite._MCP_SESSION.post') as mock_post:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_mcp_response
@@ -87,14 +97,72 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
                     # Verify find_partners was called
                     mock_find_partners.assert_called()
     
+    @unittest.skipIf(not os.path.exists("govcon_suite.py"), "govcon_suite module not available")
+    def test_discover_partners_with_ai_cached(self):
+        """Test repeated discovery for the same request is served from cache"""
+        with patch('streamlit.session_state'):
+            import govcon_suite
+
+            with patch('govcon_suite._MCP_SESSION.post') as mock_post:
+                mock_post.side_effect = govcon_suite.requests.exceptions.ConnectionError("MCP down")
+
+                with patch('govcon_suite.find_partners') as mock_find_partners:
+                    mock_find_partners.return_value = self.mock_partners.copy()
+
+                    first = govcon_suite.discover_partners_with_ai(
+                        self.test_requirements, self.test_location, max_results=5
+                    )
+                    call_count = mock_find_partners.call_count
+                    second = govcon_suite.discover_partners_with_ai(
+                        self.test_requirements, self.test_location, max_results=5
+                    )
+
+                    self.assertEqual(first, second)
+                    self.assertEqual(mock_find_partners.call_count, call_count)
+
+                    # Mutating a returned partner must not leak into later cache hits
+                    second[0]['company_name'] = 'Changed'
+                    third = govcon_suite.discover_partners_with_ai(
+                        self.test_requirements, self.test_location, max_results=5
+                    )
+                    self.assertEqual(third, first)
+
+    def test_ddg_search_does_not_cache_empty_results(self):
+        """Test an empty (rate-limited) DuckDuckGo search is retried instead of cached"""
+        import govcon_suite
+
+        hit = [{'title': 'TechCorp Solutions', 'body': '', 'href': 'https://techcorp.com'}]
+        with patch('govcon_suite._ddg_text', side_effect=[[], hit]) as mock_text:
+            self.assertEqual(govcon_suite._ddg_search("python contractors", 5, 1), ())
+            self.assertEqual(govcon_suite._ddg_search("python contractors", 5, 1), tuple(hit))
+            self.assertEqual(govcon_suite._ddg_search("python contractors", 5, 1), tuple(hit))
+            self.assertEqual(mock_text.call_count, 2)
+
+    def test_ddg_text_replaces_failed_client(self):
+        """Test a DDGS client that fails mid-request is closed and a fresh one opened"""
+        import govcon_suite
+
+        hit = [{'title': 'TechCorp Solutions', 'body': '', 'href': 'https://techcorp.com'}]
+        broken, fresh = MagicMock(), MagicMock()
+        broken.__enter__.return_value.text.side_effect = Exception("connection reset")
+        fresh.__enter__.return_value.text.return_value = hit
+        with patch('govcon_suite.DDGS', side_effect=[broken, fresh]), \
+             patch('govcon_suite._DDG_LIMITER.wait'), \
+             patch('govcon_suite.time.sleep'):
+            self.assertEqual(govcon_suite._ddg_text("python contractors", 5), hit)
+
+        broken.__exit__.assert_called_once_with(None, None, None)
+        fresh.__exit__.assert_not_called()
+        self.assertIs(govcon_suite._DDGS_CLIENT, fresh.__enter__.return_value)
+
     @unittest.skipIf(not os.path.exists("govcon_suite.py"), "govcon_suite module not available")
     def test_discover_partners_with_ai_mcp_unavailable(self):
         """Test AI discovery fallback when MCP server is unavailable"""
         with patch('streamlit.session_state'):
             import govcon_suite
             
-            # Mock requests.post to raise connection error
-            with patch('govcon_suite.requests.post') as mock_post:
+            # Mock the MCP session post to raise connection error
+            with patch('govcon_suite._MCP_SESSION.post') as mock_post:
                 mock_post.side_effect = Exception("Connection failed")
                 
                 # Mock the basic find_partners function
@@ -127,7 +195,7 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
                 }
             }
             
-            with patch('govcon_suite.requests.post') as mock_post:
+            with patch('govcon_suite._MCP_SESSION.post') as mock_post:
                 mock_response = Mock()
                 mock_response.status_code = 200
                 mock_response.json.return_value = mock_similarity_response
@@ -162,8 +230,8 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
         with patch('streamlit.session_state'):
             import govcon_suite
             
-            # Mock requests.post to raise connection error
-            with patch('govcon_suite.requests.post') as mock_post:
+            # Mock the MCP session post to raise connection error
+            with patch('govcon_suite._MCP_SESSION.post') as mock_post:
                 mock_post.side_effect = Exception("Connection failed")
                 
                 # Test partner scoring with MCP unavailable
@@ -296,7 +364,519 @@ class TestPhase7PartnerDiscovery(unittest.TestCase):
         self.assertIn("text1", similarity_payload["params"]["arguments"])
         self.assertIn("text2", similarity_payload["params"]["arguments"])
         self.assertEqual(similarity_payload["params"]["arguments"]["domain_context"], "government_contracting")
-    
+
+    def test_ensure_monthly_partitions_moves_default_rows(self):
+        """Test rows in DEFAULT are moved into a new month and a failing month does not stop the rest"""
+        import govcon_suite
+
+        statements = []
+
+        def execute(statement, params=None):
+            sql = str(statement)
+            statements.append(sql)
+            result = MagicMock()
+            if 'pg_partitioned_table' in sql:
+                result.__iter__.return_value = iter([Mock(relname='audit_logs')])
+            result.scalar.return_value = None
+            result.fetchone.return_value = (1,)
+            if 'CREATE TABLE audit_logs_' in sql and len([s for s in statements if 'CREATE TABLE audit_logs_' in s]) == 2:
+                raise Exception("partition would overlap")
+            return result
+
+        conn = MagicMock()
+        conn.execute.side_effect = execute
+        self.assertFalse(govcon_suite.ensure_monthly_partitions(conn, months_ahead=2))
+
+        creates = [s for s in statements if s.startswith('CREATE TABLE audit_logs_2')]
+        self.assertEqual(len(creates), 3)
+        self.assertEqual(len([s for s in statements if 'DETACH PARTITION audit_logs_default' in s]), 3)
+        self.assertEqual(len([s for s in statements if 'ATTACH PARTITION audit_logs_default DEFAULT' in s]), 2)
+        self.assertEqual(conn.rollback.call_count, 1)
+        self.assertFalse(any('communications' in s for s in statements[1:]))
+
+    def test_setup_database_retries_incomplete_migrations(self):
+        """Test the schema is only marked ready once migrations complete"""
+        import govcon_suite
+
+        mock_engine = MagicMock()
+        with patch.object(govcon_suite, '_DB_READY', False), \
+             patch('govcon_suite.get_engine', return_value=mock_engine), \
+             patch('govcon_suite.send_fun_notification'), \
+             patch('govcon_suite.metadata.create_all'), \
+             patch('govcon_suite.run_database_migrations', side_effect=[False, True]) as mock_migrate:
+            govcon_suite.setup_database()
+            self.assertFalse(govcon_suite._DB_READY)
+            govcon_suite.setup_database()
+            self.assertTrue(govcon_suite._DB_READY)
+            self.assertEqual(mock_migrate.call_count, 2)
+
+    @unittest.skipIf(not os.path.exists("govcon_suite.py"), "govcon_suite module not available")
+    def test_call_mcp_tool_caches_successful_results(self):
+        """Test identical MCP calls are served from cache and errors are not cached"""
+        import govcon_suite
+
+        arguments = {"text1": "cybersecurity", "text2": "network security"}
+        with patch('govcon_suite._MCP_SESSION.post') as mock_post:
+            mock_response = Mock()
+            mock_response.status_code = 500
+            mock_post.return_value = mock_response
+
+            self.assertFalse(govcon_suite.call_mcp_tool("calculate_similarity", arguments)["success"])
+
+            mock_response.status_code = 200
+            mock_response.json.return_value = {"jsonrpc": "2.0", "id": "x", "result": {"similarity_score": 0.9}}
+            first = govcon_suite.call_mcp_tool("calculate_similarity", arguments)
+            second = govcon_suite.call_mcp_tool("calculate_similarity", dict(reversed(list(arguments.items()))))
+
+            self.assertTrue(first["success"])
+            self.assertEqual(first, second)
+            self.assertEqual(mock_post.call_count, 2)
+
+            # Mutating a returned result must not leak into later cache hits
+            second["data"]["similarity_score"] = 0.1
+            third = govcon_suite.call_mcp_tool("calculate_similarity", arguments)
+            self.assertEqual(third["data"]["similarity_score"], 0.9)
+
+            # Expired entries are fetched again
+            with patch('govcon_suite.time.monotonic',
+                       return_value=time.monotonic() + govcon_suite.MCP_CACHE_TTL_SECONDS + 1):
+                govcon_suite.call_mcp_tool("calculate_similarity", arguments)
+            self.assertEqual(mock_post.call_count, 3)
+
+    def test_match_partner_capabilities_rule_based(self):
+        """Test rule-based capability scores, threshold and ordering"""
+        from govcon_suite import match_partner_capabilities
+
+        requirements = {'skills': ['cybersecurity'], 'min_experience': 5, 'certifications': ['CMMC', 'ISO27001']}
+        capabilities = [
+            {'partner_id': 1, 'capability_type': 'cybersecurity', 'years_experience': 8,
+             'proficiency_level': 5, 'certifications': ['CMMC']},
+            {'partner_id': 2, 'capability_type': 'logistics', 'years_experience': 2,
+             'proficiency_level': 2, 'certifications': []},
+            {'partner_id': 3, 'capability_type': 'cybersecurity', 'years_experience': 5,
+             'certifications': ['CMMC', 'ISO27001']},
+        ]
+
+        matches = match_partner_capabilities(requirements, capabilities, use_ai=False)
+
+        self.assertEqual([m['partner_id'] for m in matches], [1, 3])
+        # 0.4 skill + 0.35 experience + 0.15 certs + 0.1 proficiency
+        self.assertEqual(matches[0]['match_score'], 1.0)
+        self.assertIn("High proficiency: 5/5", matches[0]['match_reasons'])
+        self.assertIn("Certifications: CMMC", matches[0]['match_reasons'])
+        # 0.4 skill + 0.2 experience + 0.3 certs
+        self.assertEqual(matches[1]['match_score'], 0.9)
+
+        with patch('govcon_suite.call_mcp_tool') as mock_mcp:
+            mock_mcp.return_value = {"success": True, "data": {"similarity_score": 0.5}}
+            ai_matches = match_partner_capabilities(requirements, capabilities, use_ai=True)
+
+        # Only the two records above the 0.2 rule-based floor are sent for AI scoring
+        self.assertEqual(mock_mcp.call_count, 2)
+        self.assertEqual([m['match_score'] for m in ai_matches], [0.85, 0.78])
+
+    @unittest.skipIf(not os.path.exists("govcon_suite.py"), "govcon_suite module not available")
+    def test_analyze_partner_performance_cached(self):
+        """Test performance analyses are reused until the partner is invalidated"""
+        import govcon_suite
+        from types import SimpleNamespace
+        from datetime import datetime
+
+        record = SimpleNamespace(created_at=datetime(2025, 1, 1), performance_score=4.5, on_time_delivery=True,
+                                 budget_adherence=1.0, quality_rating=4.5, client_satisfaction=4.5,
+                                 contract_value=100000.0)
+        mock_engine = MagicMock()
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+        mock_conn.execute.return_value.fetchall.return_value = [record]
+
+        with patch('govcon_suite.call_mcp_tool') as mock_mcp:
+            mock_mcp.return_value = {"success": False, "error": "down", "data": None}
+
+            first = govcon_suite.analyze_partner_performance(7, engine=mock_engine)
+            second = govcon_suite.analyze_partner_performance(7, engine=mock_engine)
+            self.assertEqual(first, second)
+            self.assertEqual(mock_conn.execute.call_count, 1)
+            self.assertEqual(first['overall_score'], 4.5)
+
+            # Mutating a returned analysis must not leak into later cache hits
+            second['strengths'].append('Edited by caller')
+            self.assertEqual(govcon_suite.analyze_partner_performance(7, engine=mock_engine), first)
+
+            govcon_suite.invalidate_partner_performance(7)
+            govcon_suite.analyze_partner_performance(7, engine=mock_engine)
+            self.assertEqual(mock_conn.execute.call_count, 2)
+
+    def test_get_engine_shares_one_engine_per_process(self):
+        """Test get_engine creates the engine once and retries after a failed connection"""
+        import govcon_suite
+
+        failing, working = MagicMock(), MagicMock()
+        failing.connect.side_effect = Exception("connection refused")
+        with patch.object(govcon_suite, '_ENGINE', None), \
+             patch('govcon_suite._create_db_engine', side_effect=[failing, working]) as mock_create:
+            with self.assertRaises(Exception):
+                govcon_suite._shared_engine()
+            failing.dispose.assert_called_once()
+
+            self.assertIs(govcon_suite._shared_engine(), working)
+            self.assertIs(govcon_suite._shared_engine(), working)
+            self.assertEqual(mock_create.call_count, 2)
+
+    @unittest.skipIf(not os.path.exists("govcon_suite.py"), "govcon_suite module not available")
+    def test_track_partner_interactions_bulk(self):
+        """Test bulk interaction logging uses one transaction and keeps input order"""
+        import govcon_suite
+        from types import SimpleNamespace
+
+        def execute(statement, params=None):
+            result = MagicMock()
+            sql = str(statement)
+            if 'INSERT INTO partner_interactions' in sql:
+                result.scalars.return_value.all.return_value = [101, 102, 103]
+            elif 'INSERT INTO relationship_status' in sql:
+                result.__iter__.return_value = iter([
+                    SimpleNamespace(partner_id=1, relationship_stage='active', trust_level=4),
+                    SimpleNamespace(partner_id=2, relationship_stage='prospect', trust_level=3),
+                ])
+            elif 'GROUP BY partner_id' in sql:
+                result.__iter__.return_value = iter([
+                    SimpleNamespace(partner_id=1, interaction_count=7, last_interaction='2025-01-02'),
+                    SimpleNamespace(partner_id=2, interaction_count=2, last_interaction='2025-01-03'),
+                ])
+            return result
+
+        mock_engine = MagicMock()
+        mock_conn = mock_engine.begin.return_value.__enter__.return_value
+        mock_conn.execute.side_effect = execute
+
+        with patch('govcon_suite.get_engine', return_value=mock_engine):
+            results = govcon_suite.track_partner_interactions_bulk([
+                {'partner_id': 1, 'type': 'call'},
+                {'partner_id': 2, 'type': 'email'},
+                {'partner_id': 1, 'type': 'meeting'},
+            ])
+
+        self.assertEqual([r['interaction_id'] for r in results], [101, 102, 103])
+        self.assertEqual(results[0]['relationship_stage'], 'active')
+        self.assertEqual(results[1]['relationship_stage'], 'prospect')
+        self.assertEqual(results[2]['interaction_count'], 7)
+        # interaction insert, relationship upsert, stats
+        self.assertEqual(mock_conn.execute.call_count, 3)
+        mock_engine.begin.assert_called_once()
+
+    def test_create_shared_workspace_reuses_caller_connection(self):
+        """Test a connection passed by the caller is used in a savepoint instead of a new checkout"""
+        import govcon_suite
+        from types import SimpleNamespace
+
+        mock_engine = MagicMock()
+        mock_conn = MagicMock()
+        mock_conn.execute.return_value.fetchone.return_value = SimpleNamespace(id=7, members_added=2)
+
+        with patch('govcon_suite.get_engine', return_value=mock_engine), \
+             patch('govcon_suite.call_mcp_tool', return_value={'success': False}):
+            result = govcon_suite.create_shared_workspace(
+                {'name': 'Alpha', 'type': 'partnership', 'owner_id': 1}, conn=mock_conn)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['workspace_id'], 7)
+        self.assertEqual(result['initial_setup']['folders_created'],
+                         ['Agreements', 'Communications', 'Joint_Documents'])
+        mock_engine.connect.assert_not_called()
+        mock_engine.begin.assert_not_called()
+        # The caller owns the transaction; the helper only uses a savepoint
+        mock_conn.begin_nested.assert_called_once()
+        mock_conn.commit.assert_not_called()
+        mock_conn.close.assert_not_called()
+
+    def test_generate_progress_report_single_metrics_query(self):
+        """Test the progress report reads all workspace aggregates in one query"""
+        import govcon_suite
+        from types import SimpleNamespace
+
+        metrics = SimpleNamespace(
+            task_metrics={'total_tasks': 10, 'completed_tasks': 5, 'in_progress_tasks': 3,
+                          'not_started_tasks': 2, 'overdue_tasks': 1, 'avg_completion': 50.0,
+                          'total_estimated_hours': 80.0, 'total_actual_hours': 40.0},
+            milestone_metrics={'total_milestones': 4, 'completed_milestones': 1,
+                               'in_progress_milestones': 2, 'overdue_milestones': 1},
+            deliverable_metrics={'total_deliverables': 0, 'approved_deliverables': 0,
+                                 'submitted_deliverables': 0, 'avg_quality_score': None}
+        )
+
+        def execute(statement, params=None):
+            result = MagicMock()
+            if 'to_jsonb' in str(statement):
+                result.fetchone.return_value = metrics
+            else:
+                result.scalar_one.return_value = 9
+            return result
+
+        mock_engine = MagicMock()
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+        mock_conn.execute.side_effect = execute
+
+        with patch('govcon_suite.get_engine', return_value=mock_engine), \
+             patch('govcon_suite.call_mcp_tool', return_value={'success': False}):
+            result = govcon_suite.generate_progress_report(5)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['report_id'], 9)
+        self.assertEqual(result['overall_progress'], 37.5)
+        self.assertEqual(result['summary_metrics']['team_utilization'], 50.0)
+        self.assertIn('1 milestones are behind schedule', result['challenges'])
+        # metrics query and report insert
+        self.assertEqual(mock_conn.execute.call_count, 2)
+
+    def test_generate_progress_reports_bulk(self):
+        """Test bulk progress reports use one metrics query and one insert"""
+        import govcon_suite
+        from types import SimpleNamespace
+
+        def metrics(workspace_id, completed):
+            return SimpleNamespace(
+                workspace_id=workspace_id,
+                task_metrics={'total_tasks': 4, 'completed_tasks': completed, 'in_progress_tasks': 0,
+                              'not_started_tasks': 0, 'overdue_tasks': 0, 'avg_completion': None,
+                              'total_estimated_hours': 0, 'total_actual_hours': 0},
+                milestone_metrics={'total_milestones': 0, 'completed_milestones': 0,
+                                   'in_progress_milestones': 0, 'overdue_milestones': 0},
+                deliverable_metrics={}
+            )
+
+        def execute(statement, params=None):
+            result = MagicMock()
+            if 'to_jsonb' in str(statement):
+                self.assertEqual(params['workspace_ids'], [2, 1])
+                result.__iter__.return_value = iter([metrics(1, 4), metrics(2, 2)])
+            else:
+                self.assertEqual([row['workspace_id'] for row in params], [2, 1])
+                result.scalars.return_value.all.return_value = [21, 22]
+            return result
+
+        mock_engine = MagicMock()
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+        mock_conn.execute.side_effect = execute
+
+        with patch('govcon_suite.get_engine', return_value=mock_engine):
+            results = govcon_suite.generate_progress_reports_bulk([2, 1])
+
+        self.assertEqual([r['report_id'] for r in results], [21, 22])
+        self.assertEqual([r['overall_progress'] for r in results], [25.0, 50.0])
+        self.assertEqual(mock_conn.execute.call_count, 2)
+        mock_conn.commit.assert_called_once()
+
+    def test_analyze_partnership_roi_batch_matches_single(self):
+        """Test the vectorised ROI batch agrees with the per-partnership analysis"""
+        import govcon_suite
+        import pandas as pd
+
+        partnerships = [
+            {'total_investment': 100000.0, 'total_revenue': 300000.0, 'operational_costs': 20000.0},
+            {'total_investment': 50000.0, 'total_revenue': 20000.0, 'jv_profits': 1500.0},
+        ]
+        batch = govcon_suite.analyze_partnership_roi_batch(pd.DataFrame(partnerships))
+
+        with patch('govcon_suite.get_engine', return_value=MagicMock()), \
+             patch('govcon_suite.call_mcp_tool', return_value={'success': False}):
+            for i, data in enumerate(partnerships):
+                single = govcon_suite.analyze_partnership_roi(data)
+                row = batch.iloc[i]
+                for key in ('net_profit', 'roi_percentage', 'payback_period_months', 'npv'):
+                    self.assertAlmostEqual(row[key], single['roi_metrics'][key])
+                for key, value in {**single['cost_breakdown'], **single['revenue_streams']}.items():
+                    self.assertAlmostEqual(row[key], value)
+
+    def test_with_db_retry_retries_operational_errors(self):
+        """Test transient OperationalErrors are retried and other errors are not"""
+        import govcon_suite
+        from sqlalchemy.exc import OperationalError
+
+        unit = Mock(side_effect=[OperationalError("SELECT 1", {}, Exception("server closed")), 'ok'])
+        with patch('govcon_suite.time.sleep') as mock_sleep:
+            self.assertEqual(govcon_suite._with_db_retry(unit), 'ok')
+            self.assertEqual(unit.call_count, 2)
+            mock_sleep.assert_called_once_with(0.2)
+
+            failing = Mock(side_effect=OperationalError("SELECT 1", {}, Exception("deadlock detected")))
+            with self.assertRaises(OperationalError):
+                govcon_suite._with_db_retry(failing)
+            self.assertEqual(failing.call_count, govcon_suite.DB_RETRY_ATTEMPTS)
+
+            broken = Mock(side_effect=ValueError("bad input"))
+            with self.assertRaises(ValueError):
+                govcon_suite._with_db_retry(broken)
+            self.assertEqual(broken.call_count, 1)
+
+    def test_with_db_write_retry_never_repeats_a_sent_commit(self):
+        """Test writes are retried before COMMIT but not after a COMMIT fails in flight"""
+        import govcon_suite
+        from sqlalchemy.exc import OperationalError
+
+        mock_engine = MagicMock()
+        mock_conn = mock_engine.connect.return_value.__enter__.return_value
+        dropped = OperationalError("INSERT", {}, Exception("server closed"))
+        with patch('govcon_suite.time.sleep'):
+            work = Mock(side_effect=[dropped, 'ok'])
+            self.assertEqual(govcon_suite._with_db_write_retry(mock_engine, work), 'ok')
+            self.assertEqual(work.call_count, 2)
+            mock_conn.commit.assert_called_once()
+
+            # The server may already have committed, so the insert must not run again
+            work = Mock(return_value='ok')
+            mock_conn.commit.side_effect = OperationalError("COMMIT", {}, Exception("server closed"))
+            with self.assertRaises(OperationalError):
+                govcon_suite._with_db_write_retry(mock_engine, work)
+            self.assertEqual(work.call_count, 1)
+
+    def test_evaluate_partnership_risks_scores_and_matrix(self):
+        """Test risk scores, weighted total and matrix placement come from one pass"""
+        import govcon_suite
+
+        risk_data = {
+            'market_risk': {'probability': 0.5, 'impact': 'high'},
+            'strategic_risk': {'probability': 0.1, 'impact': 'high'},
+            'financial_risk': {'probability': 0.4, 'impact': 'low'}
+        }
+        with patch('govcon_suite.get_engine', return_value=MagicMock()), \
+             patch('govcon_suite.call_mcp_tool', return_value={'success': False}):
+            result = govcon_suite.evaluate_partnership_risks(risk_data)
+
+        self.assertAlmostEqual(result['risk_categories']['market_risk']['score'], 2.5)
+        self.assertEqual(result['risk_categories']['market_risk']['level'], 'moderate')
+        self.assertEqual(result['overall_risk_score'], 0.8)
+        self.assertEqual(result['risk_matrix'], {
+            'high_probability_high_impact': ['market_risk'],
+            'high_probability_low_impact': ['financial_risk'],
+            'low_probability_high_impact': ['strategic_risk'],
+            'low_probability_low_impact': ['operational_risk', 'regulatory_risk', 'technology_risk']
+        })
+
+    def test_calculate_team_score_capability_coverage(self):
+        """Test team coverage counts only required skills covered by known members"""
+        from govcon_suite import calculate_team_score
+
+        partner_details = [
+            {'id': 1, 'capabilities': ['python', 'cloud'], 'performance_score': 5.0, 'budget_reliability': 1.0},
+            {'id': 2, 'capabilities': ['cybersecurity'], 'performance_score': 5.0, 'budget_reliability': 1.0},
+        ]
+        requirements = {'skills': ['python', 'cybersecurity', 'data analytics'], 'preferred_team_size': 2}
+
+        full = calculate_team_score([{'id': 1}, {'partner_id': 2}], requirements, partner_details)
+        partial = calculate_team_score([{'id': 1}, {'id': 99}], requirements, partner_details)
+
+        # 2/3 coverage * 0.4 + 0.3 performance + 0.2 budget + 0.1 size, scaled to 5
+        self.assertEqual(full, 4.33)
+        self.assertLess(partial, full)
+
+    def test_generate_rule_based_teams_strategies(self):
+        """Test each rule-based strategy picks members by performance and new coverage"""
+        from govcon_suite import generate_rule_based_teams
+
+        partner_details = [
+            {'id': i, 'name': f'P{i}', 'capabilities': caps, 'performance_score': score, 'budget_reliability': 1.0}
+            for i, (caps, score) in enumerate([
+                (['python'], 3.5), (['cloud'], 4.5), (['python'], 4.9), (['security'], 2.0), (['data'], 3.1)
+            ])
+        ]
+
+        teams = generate_rule_based_teams(partner_details, {'skills': ['python', 'cloud', 'data']})
+
+        self.assertEqual([t['team_name'] for t in teams],
+                         ['High Performance Team', 'Capability Coverage Team', 'Balanced Team'])
+        self.assertEqual([m['name'] for m in teams[0]['team_members']], ['P2', 'P1', 'P0'])
+        self.assertEqual([m['name'] for m in teams[1]['team_members']], ['P2', 'P1', 'P4'])
+        self.assertIn('Incomplete capability coverage', teams[0]['risks'])
+        self.assertIn('Complete capability coverage', teams[1]['strengths'])
+
+    def test_generate_partner_performance_dashboard_overview(self):
+        """Test the all-partner dashboard assembles overview, trend and alert queries"""
+        import govcon_suite
+        from types import SimpleNamespace
+
+        def execute(statement, params):
+            result = MagicMock()
+            if statement is govcon_suite.DASHBOARD_OVERVIEW:
+                result.fetchall.return_value = [SimpleNamespace(
+                    total_partners=3, active_count=2, total_revenue=1000.0,
+                    avg_response_time=5.55, avg_satisfaction=4.04,
+                    top_performers=[{'name': 'TechCorp Solutions', 'score': 4.44, 'revenue': 600.0}])]
+            elif statement is govcon_suite.DASHBOARD_ALERTS:
+                result.fetchall.return_value = [SimpleNamespace(type='warning', message='TechCorp slow')]
+            else:
+                result.fetchall.return_value = [
+                    SimpleNamespace(metric_date=None, avg_response_time=10.0 - day,
+                                    avg_satisfaction=4.0, total_revenue=100.0 * day)
+                    for day in range(1, 5)]
+            return result
+
+        mock_conn = MagicMock()
+        mock_conn.execute.side_effect = execute
+        mock_engine = MagicMock()
+        mock_engine.connect.return_value.__enter__.return_value = mock_conn
+
+        with patch('govcon_suite.get_engine', return_value=mock_engine):
+            result = govcon_suite.generate_partner_performance_dashboard(time_period='7d')
+
+        data = result['dashboard_data']
+        self.assertTrue(result['success'])
+        self.assertEqual(data['summary_metrics']['active_partnerships'], 2)
+        self.assertEqual(data['top_performers'], [{'name': 'TechCorp Solutions', 'score': 4.4, 'revenue': 600.0}])
+        self.assertEqual(data['performance_trends'], {
+            'response_time_trend': 'improving',
+            'satisfaction_trend': 'stable',
+            'revenue_trend': 'growing'
+        })
+        self.assertEqual(data['alerts'], [{'type': 'warning', 'message': 'TechCorp slow'}])
+
+    def test_dashboard_listener_without_notifies_timeout(self):
+        """Test the listener falls back to a notify handler on psycopg 3.0/3.1"""
+        import govcon_suite
+
+        class StopListener(BaseException):
+            pass
+
+        dbapi_conn = MagicMock()
+        handlers = []
+        dbapi_conn.add_notify_handler.side_effect = handlers.append
+
+        def execute(sql):
+            # Each poll delivers one notification; the second poll fails so
+            # the listener drops into its reconnect sleep and the test exits
+            for handler in handlers:
+                handler(Mock(channel=govcon_suite.DASHBOARD_NOTIFY_CHANNEL, payload='7'))
+            if dbapi_conn.execute.call_count > 1:
+                raise Exception("connection closed")
+
+        dbapi_conn.execute.side_effect = execute
+        mock_engine = MagicMock()
+        mock_engine.raw_connection.return_value.driver_connection = dbapi_conn
+
+        with patch('govcon_suite._psycopg_notifies_has_timeout', return_value=False), \
+             patch('govcon_suite.select.select'), \
+             patch('govcon_suite._dashboard_cached') as mock_cached, \
+             patch.dict('govcon_suite._DASHBOARD_GENERATIONS', clear=True), \
+             patch('govcon_suite.time.sleep', side_effect=StopListener):
+            with self.assertRaises(StopListener):
+                govcon_suite._listen_for_metric_changes(mock_engine)
+
+            # Only partner 7 and the all-partners view were invalidated
+            self.assertGreater(govcon_suite._dashboard_generation(7), 0)
+            self.assertGreater(govcon_suite._dashboard_generation(None), 0)
+            self.assertEqual(govcon_suite._dashboard_generation(8), 0)
+
+        dbapi_conn.notifies.assert_not_called()
+        mock_cached.cache_clear.assert_not_called()
+
+    def test_trend_direction(self):
+        """Test dashboard trend direction from the fitted slope and tolerance band"""
+        from govcon_suite import trend_direction
+
+        self.assertEqual(trend_direction([10.0, 12.0, 15.0]), 1)
+        self.assertEqual(trend_direction([8.0, None, 4.0]), -1)
+        self.assertEqual(trend_direction([4.0, 4.05, 4.0, 4.02]), 0)
+        self.assertEqual(trend_direction([None, 3.0]), 0)
+
     def test_confidence_level_calculation(self):
         """Test confidence level calculation based on AI scores"""
         